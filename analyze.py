@@ -1,77 +1,141 @@
 from datetime import date
 
+import numpy as np
+from numba import njit, prange
+
+# The kernels below declare explicit signatures, so Numba compiles them when
+# this module is imported rather than on the first analytics call, and
+# cache=True stores the machine code in __pycache__ for later runs.
+# Set NUMBA_DISABLE_JIT=1 to run them as plain Python (e.g. for debugging).
+
 
 def list_habits(habits):
     """
-    Returns a list of dictionaries with habit name and periodicity
+    Returns a list of (name, periodicity) tuples
     """
     if not habits:
         return []
 
     return [
-        {h.name : h.periodicity}
+        (h.name, h.periodicity)
         for h in habits
     ]
 
 
-def longest_streak_for_habit(habit):
+def _to_ordinals(habit):
     """
-    Calculates the longest streak for a single habit.
-    Handles duplicate completion dates safely.
+    Returns the habit's sorted completion ordinals as an int32 array.
+    The array is kept on the habit and rebuilt only after its completions change.
     """
+    if habit._ords is None:
+        habit._ords = np.array(habit._ord_sorted, dtype=np.int32)
 
-    if not habit.completions:
-        return 0
+    return habit._ords
 
-    # remove duplicates and sort
-    sorted_dates = sorted(set(habit.completions))
 
-    expected_gap = 1 if habit.periodicity == "daily" else 7
+@njit('UniTuple(i4, 2)(i4[::1], i4, i8)', cache=True, fastmath=False)
+def _streak_runs(a, gap, today):
+    """
+    Returns (longest run, current run) of ordinals spaced exactly `gap` apart,
+    in a single pass. The current run is the one ending at the last ordinal,
+    or 0 if that ordinal is more than `gap` days before `today`.
+    """
+    n = a.shape[0]
+    if n == 0:
+        return 0, 0
 
-    max_streak = 1
-    current_streak = 1
+    best = 1
+    cur = 1
 
-    for i in range(1, len(sorted_dates)):
-        delta = (sorted_dates[i] - sorted_dates[i - 1]).days
+    # Branchless: eq is 0 or 1, so the run either grows or restarts at 1
+    for i in range(1, n):
+        eq = np.int32(a[i] - a[i - 1] == gap)
+        cur = cur * eq + 1
+        best = max(best, cur)
 
-        if delta == expected_gap:
-            current_streak += 1
-        else:
-            current_streak = 1
+    # If last completion too old → no current streak
+    if today - a[n - 1] > gap:
+        cur = 0
 
-        max_streak = max(max_streak, current_streak)
+    return best, cur
 
-    return max_streak
 
+@njit('Tuple((i4[::1], i4[::1]))(i4[::1], i8[::1], i4[::1], i8)', parallel=True, cache=True)
+def _streaks_all(flat, offsets, gaps, today):
+    """
+    Returns (longest runs, current runs) for every habit at once, one habit per thread.
+    Habit i owns flat[offsets[i]:offsets[i + 1]] and uses gaps[i].
+    """
+    longest = np.empty(gaps.size, np.int32)
+    current = np.empty(gaps.size, np.int32)
+
+    for i in prange(gaps.size):
+        longest[i], current[i] = _streak_runs(flat[offsets[i]:offsets[i + 1]], gaps[i], today)
+
+    return longest, current
 
-def current_streak_for_habit(habit):
+
+def _batch_streaks(habits, today):
     """
-    Calculates the current active streak (up to today).
+    Returns int32 arrays (longest, current) with the streaks of each habit,
+    computed in one parallel kernel call. Also fills each habit's caches.
     """
+    arrays = [_to_ordinals(h) for h in habits]
 
-    if not habit.completions:
-        return 0
+    offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+    np.cumsum([a.size for a in arrays], out=offsets[1:])
 
-    sorted_dates = sorted(set(habit.completions))
-    expected_gap = 1 if habit.periodicity == "daily" else 7
+    flat = np.concatenate(arrays)
+    gaps = np.array([h.gap for h in habits], dtype=np.int32)
 
-    today = date.today()
-    last_completion = sorted_dates[-1]
+    longest, current = _streaks_all(flat, offsets, gaps, today)
 
-    # If last completion too old → no current streak
-    if (today - last_completion).days > expected_gap:
-        return 0
+    for h, best, cur in zip(habits, longest.tolist(), current.tolist()):
+        h._longest_cache = best
+        h._cur_cache = (today, len(h._ord_sorted), cur)
 
-    streak = 1
+    return longest, current
 
-    for i in range(len(sorted_dates) - 1, 0, -1):
-        delta = (sorted_dates[i] - sorted_dates[i - 1]).days
-        if delta == expected_gap:
-            streak += 1
-        else:
-            break
 
-    return streak
+def _fill_streak_caches(habit, today):
+    """
+    Runs the streak kernel once and caches both the longest
+    and the current streak on the habit.
+    """
+    longest, current = _streak_runs(_to_ordinals(habit), habit.gap, today)
+
+    habit._longest_cache = int(longest)
+    habit._cur_cache = (today, len(habit._ord_sorted), int(current))
+
+
+def longest_streak_for_habit(habit):
+    """
+    Calculates the longest streak for a single habit.
+    Completions are kept sorted and unique by Habit, so no re-sort is needed.
+    The result is cached on the habit until its completions change.
+    """
+
+    if habit._longest_cache is None:
+        _fill_streak_caches(habit, date.today().toordinal())
+
+    return habit._longest_cache
+
+
+def current_streak_for_habit(habit, today_ord=None):
+    """
+    Calculates the current active streak (up to today).
+    `today_ord` is today's date ordinal; pass it in when looping over many habits.
+    The result is cached on the habit for the rest of the day
+    or until its completions change.
+    """
+
+    today = date.today().toordinal() if today_ord is None else today_ord
+    key = (today, len(habit._ord_sorted))
+
+    if habit._cur_cache is None or habit._cur_cache[:2] != key:
+        _fill_streak_caches(habit, today)
+
+    return habit._cur_cache[2]
 
 
 def habit_summary_with_current_streak(habits):
@@ -87,12 +151,13 @@ def habit_summary_with_current_streak(habits):
     """
 
     summary = []
+    today_ord = date.today().toordinal()
 
     for h in habits:
         summary.append({
             "name": h.name,
             "periodicity": h.periodicity,
-            "current_streak": current_streak_for_habit(h)
+            "current_streak": current_streak_for_habit(h, today_ord)
         })
 
     return summary
@@ -105,20 +170,13 @@ def longest_streak_all_habits(habits):
     if not habits:
         return [], 0
 
-    max_streak = 0
-    habits_with_max = []
-
-    for h in habits:
-        streak = longest_streak_for_habit(h)
-
-        if streak > max_streak:
-            max_streak = streak
-            habits_with_max = [h.name]
+    streaks, _ = _batch_streaks(habits, date.today().toordinal())
+    max_streak = int(streaks.max(initial=0))
 
-        elif streak == max_streak:
-            habits_with_max.append(h.name)
+    # All habits tied for the maximum, in their original order
+    idxs = np.flatnonzero(streaks == max_streak)
 
-    return habits_with_max, max_streak
+    return [habits[i].name for i in idxs], max_streak
 
 
 def longest_streak_by_periodicity(habits):
@@ -133,11 +191,13 @@ def longest_streak_by_periodicity(habits):
     }
     """
 
-    result = {}
+    if not habits:
+        return {}
 
-    for h in habits:
-        streak = longest_streak_for_habit(h)
+    result = {}
+    streaks, _ = _batch_streaks(habits, date.today().toordinal())
 
+    for h, streak in zip(habits, streaks.tolist()):
         if h.periodicity not in result:
             result[h.periodicity] = (h.name, streak)
 
@@ -147,4 +207,36 @@ def longest_streak_by_periodicity(habits):
             if streak > current_best_streak:
                 result[h.periodicity] = (h.name, streak)
 
-    return result
\ No newline at end of file
+    return result
+
+
+def compute_all(habits):
+    """
+    Computes current and longest streak for every habit in one parallel
+    kernel call, scanning each habit's completions exactly once.
+
+    Returns a list of dictionaries:
+    [
+        {
+            "name": habit_name,
+            "periodicity": periodicity,
+            "current": current_streak,
+            "longest": longest_streak
+        },
+    ]
+    """
+
+    if not habits:
+        return []
+
+    longest, current = _batch_streaks(habits, date.today().toordinal())
+
+    return [
+        {
+            "name": h.name,
+            "periodicity": h.periodicity,
+            "current": cur,
+            "longest": best
+        }
+        for h, best, cur in zip(habits, longest.tolist(), current.tolist())
+    ]
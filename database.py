@@ -1,17 +1,36 @@
 import sqlite3
 from datetime import date
+from itertools import groupby
+
+import numpy as np
+
 from habit import Habit
 
 # --------------------------------------------------
 # Connection Handling
 # --------------------------------------------------
-def get_db(db_name="main.db"):
+def get_db(db_name="main.db", wal=False):
     """
     Create and return a SQLite database connection.
     Enables foreign key constraints.
+
+    Args:
+        db_name (str): Path to the database file
+        wal (bool): Tune for fast bulk writes: WAL journaling with
+            synchronous=NORMAL so commits do not force a full disk sync, and
+            temp_store=MEMORY so temporary tables and indices stay in RAM.
+            WAL mode is stored in the database file itself and leaves
+            -wal/-shm files next to it, so only use it for throwaway
+            databases such as the test fixture.
     """
     db=sqlite3.connect(db_name)
     db.execute("PRAGMA foreign_keys = ON")
+
+    if wal:
+        db.execute("PRAGMA journal_mode = WAL")
+        db.execute("PRAGMA synchronous = NORMAL")
+        db.execute("PRAGMA temp_store = MEMORY")
+
     return db
 
 # --------------------------------------------------
@@ -48,7 +67,8 @@ def create_tables(db):
 def save_habit(db, habit):
     """
     Save a new habit into the database.
-    The ID is automatically generated by SQLite.
+    The ID is automatically generated by SQLite,
+    stored on the habit and returned.
     """
 
     cur = db.cursor()
@@ -61,15 +81,38 @@ def save_habit(db, habit):
     habit.id = cur.lastrowid
     db.commit()
 
-def save_completion(db, habit_id, completion_date):
+    return habit.id
+
+def save_completion(db, habit_id, completion_ordinal):
     """
     Save a completion record for a habit.
+    The completion is given as a day ordinal and stored as an ISO date.
     """
     cur = db.cursor()
     cur.execute("""
         INSERT INTO completions (habit_id, completion_date)
         VALUES (?, ?)
-    """, (habit_id, completion_date.isoformat()))
+    """, (habit_id, date.fromordinal(completion_ordinal).isoformat()))
+
+    db.commit()
+
+def save_completions_bulk(db, rows):
+    """
+    Save many completion records in a single statement and commit.
+    Completions are given as day ordinals and stored as ISO dates.
+
+    Args:
+        db: Database connection
+        rows: Iterable of (habit_id, completion_ordinal) tuples
+    """
+    cur = db.cursor()
+    cur.executemany("""
+        INSERT INTO completions (habit_id, completion_date)
+        VALUES (?, ?)
+    """, (
+        (habit_id, date.fromordinal(o).isoformat())
+        for habit_id, o in rows
+    ))
 
     db.commit()
 
@@ -79,12 +122,13 @@ def save_habits(db, habits):
     """
     create_tables(db)
 
+    rows = []
+
     for habit in habits:
         save_habit(db, habit)
-        for completion in habit.completions:
-            save_completion(db, habit.id, completion)
+        rows.extend((habit.id, o) for o in habit.ordinals)
 
-    db.commit()
+    save_completions_bulk(db, rows)
 
 
 # --------------------------------------------------
@@ -99,19 +143,28 @@ def load_habits(db):
     cur.execute("SELECT * FROM habits")
     habits_data = cur.fetchall()
 
+    # Load all completions in one query, already sorted and de-duplicated,
+    # and turn each habit's dates into a contiguous int32 ordinal array
+    cur.execute("""
+        SELECT DISTINCT habit_id, completion_date
+        FROM completions
+        ORDER BY habit_id, completion_date
+    """)
+
+    ords_by_habit = {}
+    for habit_id, rows in groupby(cur.fetchall(), key=lambda r: r[0]):
+        ords_by_habit[habit_id] = np.fromiter(
+            (date.fromisoformat(r[1]).toordinal() for r in rows),
+            dtype=np.int32,
+        )
+
     habits = []
 
     for h in habits_data:
         habit = Habit(h[0], h[1], h[2], date.fromisoformat(h[3]))
-        # Load completions
-        cur.execute(
-            "SELECT completion_date FROM completions WHERE habit_id=?",
-            (h[0],)
-        )
 
-        habit.completions = [
-            date.fromisoformat(r[0]) for r in cur.fetchall()
-        ]
+        if h[0] in ords_by_habit:
+            habit.load_ordinals(ords_by_habit[h[0]])
 
         habits.append(habit)
 
@@ -1,3 +1,4 @@
+import bisect
 from datetime import date
 
 class Habit:
@@ -8,8 +9,10 @@ class Habit:
         id (int): Unique identifier of the habit.
         name (str): Name of the habit.
         periodicity (str): Either "daily" or "weekly".
+        gap (int): Days between completions for the periodicity (1 or 7).
         start_date (date): The date when tracking starts.
-        completions (List[date]): List of completion dates.
+        completions (List[date]): Sorted list of unique completion dates.
+            Stored in memory as day ordinals (see `ordinals`).
         max_streak (int): Longest streak achieved.
     """
 
@@ -22,18 +25,43 @@ class Habit:
         Raises:
             ValueError: If periodicity is not 'daily' or 'weekly'.
         """
-        if periodicity not in self.VALID_PERIODICITY:
-            raise ValueError("periodicity must be 'daily' or 'weekly'")
-
         self.id=habit_id
         self.name=name
-        self.periodicity=periodicity #daily or weekly
+        # The caches must exist before periodicity is assigned:
+        # the periodicity setter validates the value and then clears them.
+        self._longest_cache: int | None = None #cleared whenever streaks may change
+        self._cur_cache: tuple[int, int, int] | None = None #(today, completions, streak)
+        self.periodicity=periodicity #daily or weekly; also sets gap
         self.start_date=start_date
-        self.completions=[] #list of date
+        self._ord_sorted: list[int] = [] #sorted unique date ordinals
+        self._ord_set: set[int] = set() #same ordinals, for O(1) lookup
+        self._ords = None #int32 array of the same ordinals, built on demand
         self.max_streak = 1
 
 
 
+    @property
+    def periodicity(self):
+        """
+        Return the periodicity ("daily" or "weekly").
+        """
+        return self._periodicity
+
+    @periodicity.setter
+    def periodicity(self, value):
+        """
+        Change the periodicity. Streaks depend on it, so cached values are cleared.
+
+        Raises:
+            ValueError: If periodicity is not 'daily' or 'weekly'.
+        """
+        if value not in self.VALID_PERIODICITY:
+            raise ValueError("periodicity must be 'daily' or 'weekly'")
+
+        self._periodicity = value
+        self.gap = self.VALID_PERIODICITY[value] #days between completions
+        self._invalidate()
+
     def complete(self, completion_date=None):
         """
         Mark the habit as completed for a given date.
@@ -48,17 +76,72 @@ class Habit:
         if completion_date < self.start_date:
             raise ValueError("completion date cannot be before than start date")
 
-        if completion_date not in self.completions:
-            self.completions.append(completion_date)
+        o = completion_date.toordinal()
+        if o in self._ord_set:
+            return
+
+        self._ord_set.add(o)
+
+        # Completions usually arrive in date order, so appending is the common case
+        if not self._ord_sorted or o > self._ord_sorted[-1]:
+            self._ord_sorted.append(o)
+        else:
+            bisect.insort(self._ord_sorted, o)
+        self._ords = None
+        self._invalidate()
+
+    @property
+    def completions(self):
+        """
+        Return the completion dates in ascending order.
+        """
+        return [date.fromordinal(o) for o in self._ord_sorted]
+
+    @completions.setter
+    def completions(self, dates):
+        """
+        Replace all completions, dropping duplicates.
+        """
+        self._ord_set = {d.toordinal() for d in dates}
+        self._ord_sorted = sorted(self._ord_set)
+        self._ords = None
+        self._invalidate()
+
+    @property
+    def ordinals(self):
+        """
+        Return the completion dates as a sorted tuple of day ordinals (date.toordinal()).
+        """
+        return tuple(self._ord_sorted)
+
+    def load_ordinals(self, ords):
+        """
+        Replace all completions with an int32 array of date ordinals
+        that is already sorted and free of duplicates (as loaded from the database).
+        """
+        self._ords = ords
+        self._ord_sorted = ords.tolist()
+        self._ord_set = set(self._ord_sorted)
+        self._invalidate()
 
     def reset(self):
         """
         Reset all recorded completions.
         """
-        self.completions=[]
+        self._ord_sorted = []
+        self._ord_set = set()
+        self._ords = None
+        self._invalidate()
+
+    def _invalidate(self):
+        """
+        Clear cached streak values after completions or periodicity change.
+        """
+        self._longest_cache = None
+        self._cur_cache = None
 
     def __str__(self):
         """
         Return a readable string representation of the habit.
         """
-        return f"{self.name} ({self.periodicity}): {len(self.completions)} completions"
+        return f"{self.name} ({self.periodicity}): {len(self._ord_sorted)} completions"
@@ -28,15 +28,15 @@ def get_valid_int(prompt):
         return None
 
 
-def add_habit(db, habits):
+def add_habit(db, habits, by_lname):
     """
-    Add a new habit to the database and refresh the in-memory habit list.
+    Add a new habit to the database and to the in-memory habit list.
     Prevents duplicate habit names (case-insensitive).
     """
     name = input("Habit name: ").strip()
 
     # Check for duplicate habit names
-    if any(h.name.lower() == name.lower() for h in habits):
+    if name.lower() in by_lname:
         print("Habit already exists.")
         return
 
@@ -50,12 +50,11 @@ def add_habit(db, habits):
     # Create habit object (ID assigned by database)
     habit = Habit(None, name, periodicity, date.today())
 
-    # Save habit to database
+    # Save habit to database; SQLite assigns the ID and save_habit stores it on the habit
     database.save_habit(db, habit)
 
-    # Reload habits to get correct ID from database
-    habits.clear()
-    habits.extend(database.load_habits(db))
+    habits.append(habit)
+    by_lname[name.lower()] = habit
 
     print(f"Habit '{name}' added successfully.")
 
@@ -84,14 +83,15 @@ def complete_habit(db, habits):
     habit = habits[choice - 1]
 
     if habit:
-        habit.complete()
-        database.save_completion(db, habit.id, date.today())
+        today = date.today()
+        habit.complete(today)
+        database.save_completion(db, habit.id, today.toordinal())
         print(f"Habit '{habit.name}' marked as completed.")
     else:
         print("Habit ID not found.")
 
 
-def edit_habit(db, habits):
+def edit_habit(db, habits, by_lname):
     """
     Edit an existing habit's name and/or periodicity.
     """
@@ -137,10 +137,7 @@ def edit_habit(db, habits):
         return
 
     # Check duplicate name
-    if new_name and any(
-        h.name.lower() == new_name.lower() and h.id != habit.id
-        for h in habits
-    ):
+    if new_name and by_lname.get(new_name.lower(), habit) is not habit:
         print("Another habit with this name already exists.")
         return
 
@@ -154,13 +151,15 @@ def edit_habit(db, habits):
 
     # Update in-memory object
     if new_name:
+        by_lname.pop(habit.name.lower(), None)
         habit.name = new_name
+        by_lname[new_name.lower()] = habit
     if new_periodicity:
         habit.periodicity = new_periodicity
 
     print("Habit edited successfully.")
 
-def delete_habit_cli(db, habits):
+def delete_habit_cli(db, habits, by_lname):
     """
     Delete a habit using the database layer.
     Also removes it from the in-memory list.
@@ -194,6 +193,7 @@ def delete_habit_cli(db, habits):
 
     # Remove from memory
     habits.remove(habit)
+    by_lname.pop(habit.name.lower(), None)
 
     print(f"Habit '{habit.name}' deleted successfully.")
 
@@ -211,37 +211,36 @@ def show_analytics(habits):
         print("No habits available.")
         return
 
-    print("\n--- Habit Overview ---")
+    # Single pass over all habits; every section below is derived from it
+    rows = analyze.compute_all(habits)
 
-    summary = analyze.habit_summary_with_current_streak(habits)
+    print("\n--- Habit Overview ---")
 
     # Print summary table
     print(f"{'Name':15} {'Periodicity':12} {'Current Streak'}")
     print("-" * 40)
 
-    for item in summary:
-        print(f"{item['name']:15} {item['periodicity']:12} {item['current_streak']}")
+    for row in rows:
+        print(f"{row['name']:15} {row['periodicity']:12} {row['current']}")
 
     print("\n--- Longest Streak Per Habit ---")
-    for h in habits:
-        streak = analyze.longest_streak_for_habit(h)
-        print(f"{h.name}: {streak}")
+    for row in rows:
+        print(f"{row['name']}: {row['longest']}")
 
     print("\n--- Longest Streak By Periodicity ---")
-    result = analyze.longest_streak_by_periodicity(habits)
+    best_by_period = {}
+    for row in rows:
+        best = best_by_period.get(row["periodicity"])
+        if best is None or row["longest"] > best[1]:
+            best_by_period[row["periodicity"]] = (row["name"], row["longest"])
 
-    # Handle tie situations (multiple habits with same streak)
-    for period, value in result.items():
-        if isinstance(value, list):  # tie-handling version
-            for name, streak in value:
-                print(f"{period}: {name} ({streak})")
-        else:
-            name, streak = value
-            print(f"{period}: {name} ({streak})")
+    for period, (name, streak) in best_by_period.items():
+        print(f"{period}: {name} ({streak})")
 
     print("\n--- Longest Streak Overall ---")
-    names, streak = analyze.longest_streak_all_habits(habits)
-    print(f"{names} → {streak}")
+    max_streak = max(row["longest"] for row in rows)
+    names = [row["name"] for row in rows if row["longest"] == max_streak]
+    print(f"{names} → {max_streak}")
 
 
 def run():
@@ -251,12 +250,15 @@ def run():
     # Load existing habits from database
     habits = database.load_habits(db)
 
+    # Case-insensitive name index for O(1) duplicate checks
+    by_lname = {h.name.lower(): h for h in habits}
+
     while True:
         print_menu()
         choice = input("Choose an option: ")
 
         if choice == "1":
-            add_habit(db, habits)
+            add_habit(db, habits, by_lname)
 
         elif choice == "2":
             complete_habit(db, habits)
@@ -265,10 +267,10 @@ def run():
             show_analytics(habits)
 
         elif choice == "4":
-            edit_habit(db, habits)
+            edit_habit(db, habits, by_lname)
 
         elif choice == "5":
-            delete_habit_cli(db, habits)
+            delete_habit_cli(db, habits, by_lname)
 
         elif choice == "6":
             db.close()
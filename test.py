@@ -6,10 +6,12 @@ from habit import Habit
 from database import get_db, create_tables, load_habits, save_habits
 from analyze import (
     longest_streak_for_habit,
+    current_streak_for_habit,
     longest_streak_all_habits,
     longest_streak_by_periodicity,
     habit_summary_with_current_streak,
     list_habits,
+    compute_all,
 )
 
 
@@ -38,7 +40,8 @@ class TestHabitTracker:
         if os.path.exists(self.db_name):
             os.remove(self.db_name)
 
-        self.db = get_db(self.db_name)
+        # WAL is safe here: the test database is deleted after every test
+        self.db = get_db(self.db_name, wal=True)
         create_tables(self.db)
 
         start_date = date(2026, 1, 1)
@@ -134,6 +137,25 @@ class TestHabitTracker:
         with pytest.raises(ValueError):
             Habit(99, "Invalid", "monthly", date(2026, 1, 1))
 
+    def test_completions_sorted_and_unique(self):
+        """
+        Ensures completions stay sorted and free of duplicates
+        even when recorded out of order.
+        """
+        habit = Habit(98, "Reading", "daily", date(2026, 1, 1))
+
+        habit.complete(date(2026, 1, 3))
+        habit.complete(date(2026, 1, 1))
+        habit.complete(date(2026, 1, 3))
+        habit.complete(date(2026, 1, 2))
+
+        assert habit.completions == [
+            date(2026, 1, 1),
+            date(2026, 1, 2),
+            date(2026, 1, 3),
+        ]
+        assert longest_streak_for_habit(habit) == 3
+
     # -------------------------------------------------
     # HABIT DELETION TEST
     # -------------------------------------------------
@@ -186,6 +208,42 @@ class TestHabitTracker:
         assert longest_streak_for_habit(habit_dict["Work Out"]) == 4
         assert longest_streak_for_habit(habit_dict["Entertainment"]) == 2
 
+    def test_longest_streak_cache_invalidation(self):
+        """
+        Ensures the cached longest streak is refreshed
+        after new completions or a periodicity change.
+        """
+        habits = load_habits(self.db)
+        workout = {h.name: h for h in habits}["Work Out"]
+
+        assert longest_streak_for_habit(workout) == 4
+
+        workout.complete(date(2026, 1, 29))
+        assert longest_streak_for_habit(workout) == 5
+
+        workout.periodicity = "daily"
+        assert longest_streak_for_habit(workout) == 1
+
+    def test_current_streak_cache(self):
+        """
+        Ensures the cached current streak is recomputed when the day changes
+        and refreshed after a same-day completion.
+        """
+        habit = Habit(97, "Journal", "daily", date(2026, 1, 1))
+        for i in range(3):
+            habit.complete(date(2026, 1, 1) + timedelta(days=i))
+
+        last = date(2026, 1, 3).toordinal()
+
+        assert current_streak_for_habit(habit, today_ord=last + 1) == 3
+
+        # A later day with the same completions must not reuse the cache
+        assert current_streak_for_habit(habit, today_ord=last + 3) == 0
+
+        # Completing on the same day must not return the stale value
+        habit.complete(date(2026, 1, 4))
+        assert current_streak_for_habit(habit, today_ord=last + 1) == 4
+
     def test_longest_streak_overall(self):
         habits = load_habits(self.db)
 
@@ -219,6 +277,28 @@ class TestHabitTracker:
         assert "periodicity" in summary[0]
         assert "current_streak" in summary[0]
 
+    def test_compute_all(self):
+        habits = load_habits(self.db)
+
+        # A habit whose completions end today has a non-zero current streak
+        today = date.today()
+        active = Habit(6, "Stretching", "daily", today - timedelta(days=10))
+        for i in range(3):
+            active.complete(today - timedelta(days=i))
+        habits.append(active)
+
+        rows = {row["name"]: row for row in compute_all(habits)}
+
+        assert len(rows) == 6
+        assert rows["Skin Rutin"]["longest"] == 28
+        assert rows["Work Out"]["longest"] == 4
+        assert rows["Entertainment"]["periodicity"] == "weekly"
+        assert rows["Stretching"]["current"] == 3
+
+        for h in habits:
+            assert rows[h.name]["longest"] == longest_streak_for_habit(h)
+            assert rows[h.name]["current"] == current_streak_for_habit(h)
+
     def test_list_habits(self):
         habits = load_habits(self.db)
 
@@ -226,4 +306,5 @@ class TestHabitTracker:
 
         assert isinstance(result, list)
         assert len(result) == 5
-        assert isinstance(result[0], dict)
\ No newline at end of file
+        assert isinstance(result[0], tuple)
+        assert ("Work Out", "weekly") in result
\ No newline at end of file